@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any, List, Callable
 import logging
 import asyncio
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, BaseMessage
@@ -48,16 +49,45 @@ class ChatMessageHistory(BaseChatMessageHistory):
         """Get message history synchronously."""
         return self.messages.copy()
 
+class _SessionHistories(OrderedDict):
+    """Session message histories in least- to most-recently used order.
+    
+    Looking up an unknown session creates its history, dropping the least
+    recently used one once max_sessions are held.
+    """
+    
+    def __init__(self, max_sessions: int):
+        super().__init__()
+        self.max_sessions = max_sessions
+    
+    def __missing__(self, session_id: str) -> ChatMessageHistory:
+        if len(self) >= self.max_sessions:
+            evicted_id, evicted = self.popitem(last=False)
+            EmojiLogger.info(
+                f"Session limit of {self.max_sessions} reached, dropping history of session "
+                f"{evicted_id} ({len(evicted.messages)} messages)"
+            )
+        history = self[session_id] = ChatMessageHistory()
+        return history
+
 class ChatAgent:
     """Chat agent with document-aware conversation capabilities."""
     
-    def __init__(self):
-        """Initialize chat agent."""
+    # Default number of session histories kept before the least recently
+    # used one is dropped
+    MAX_SESSIONS = 1000
+    
+    def __init__(self, *, max_sessions: int = MAX_SESSIONS):
+        """Initialize chat agent.
+        
+        Args:
+            max_sessions: Number of session message histories to keep in memory
+        """
         self.logger = EmojiLogger
         self.chain = None
         self.llm = None
         self.memory_manager = None
-        self.message_histories: Dict[str, ChatMessageHistory] = {}
+        self.message_histories = _SessionHistories(max_sessions=max_sessions)
         self.last_request_time = None
         self.request_count = 0
         self.max_requests_per_hour = 500  # Adjust based on your API tier
@@ -68,9 +98,9 @@ class ChatAgent:
     
     def get_message_history(self, session_id: str) -> ChatMessageHistory:
         """Get or create message history for a session."""
-        if session_id not in self.message_histories:
-            self.message_histories[session_id] = ChatMessageHistory()
-        return self.message_histories[session_id]
+        history = self.message_histories[session_id]
+        self.message_histories.move_to_end(session_id)
+        return history
     
     def _check_rate_limit(self):
         """Check if we're within rate limits."""
@@ -1,9 +1,10 @@
 """
 Memory management for chat agents.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import logging
+import threading
 from langchain_core.memory import BaseMemory
 from langchain_community.chat_message_histories import ChatMessageHistory, RedisChatMessageHistory
 from langchain_community.vectorstores import Chroma
@@ -14,6 +15,57 @@ from datetime import datetime
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding and decoding
+    orjson = None
+
+def _json_dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON, preferring orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize UTF-8 JSON, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Embedding models and vector stores shared by every MemoryManager in the
+# process, so each model is loaded and each store opened only once. Sessions
+# may run in separate threads, so creation happens under a lock.
+_REGISTRY_LOCK = threading.RLock()
+_EMBEDDINGS: Dict[Tuple[str, str], SentenceTransformerEmbeddingFunction] = {}
+_VECTOR_STORES: Dict[Tuple[str, str], Chroma] = {}
+
+def _get_embeddings(model_name: str = "all-MiniLM-L6-v2", device: str = "cpu") -> SentenceTransformerEmbeddingFunction:
+    """Get the shared embedding function for a model and device."""
+    key = (model_name, device)
+    with _REGISTRY_LOCK:
+        if key not in _EMBEDDINGS:
+            _EMBEDDINGS[key] = SentenceTransformerEmbeddingFunction(
+                model_name=model_name,
+                device=device
+            )
+        return _EMBEDDINGS[key]
+
+def _get_vector_store(persist_directory: str, collection_name: str = "chat_memory") -> Chroma:
+    """Get the shared Chroma store for a directory and collection."""
+    persist_directory = str(Path(persist_directory).resolve())
+    key = (persist_directory, collection_name)
+    with _REGISTRY_LOCK:
+        if key not in _VECTOR_STORES:
+            _VECTOR_STORES[key] = Chroma(
+                persist_directory=persist_directory,
+                embedding_function=_get_embeddings(),
+                collection_name=collection_name
+            )
+        return _VECTOR_STORES[key]
+
 class MemoryManager:
     """Manages different types of memory for chat agents."""
     
@@ -36,11 +88,6 @@ class MemoryManager:
         self.query_vectors = None
         
         # Initialize appropriate memory system
-        if self.memory_type == 'vector':
-            self._init_vector_memory()
-        else:
-            self._init_buffer_memory()
-            
         self._init_storage()
         
         logging.info(f"Initialized {self.memory_type} memory system")
@@ -71,16 +118,8 @@ class MemoryManager:
             # Save conversation history
             self._save_history()
             
-            # Clean up vector store
-            if hasattr(self, 'vector_store') and self.vector_store is not None:
-                try:
-                    # Some vector stores might need special cleanup
-                    if hasattr(self.vector_store, '_client'):
-                        await self.vector_store._client.close()
-                except:
-                    pass
-            
-            # Clear resources
+            # Clear resources; the vector store is shared with other
+            # managers, so only this manager's reference is dropped
             self.conversation_history = []
             self.vector_store = None
             
@@ -95,8 +134,7 @@ class MemoryManager:
         try:
             history_file = self.data_dir / "conversation_history.json"
             if history_file.exists():
-                with open(history_file, 'r') as f:
-                    self.conversation_history = json.load(f)
+                self.conversation_history = _json_loads(history_file.read_bytes())
         except Exception as e:
             logging.warning(f"Failed to load conversation history: {str(e)}")
 
@@ -104,8 +142,7 @@ class MemoryManager:
         """Save conversation history to disk."""
         try:
             history_file = self.data_dir / "conversation_history.json"
-            with open(history_file, 'w') as f:
-                json.dump(self.conversation_history, f)
+            history_file.write_bytes(_json_dumps(self.conversation_history))
         except Exception as e:
             logging.warning(f"Failed to save conversation history: {str(e)}")
 
@@ -113,17 +150,10 @@ class MemoryManager:
         """Initialize vector store memory."""
         try:
             # Initialize embeddings with a local model
-            self.embeddings = SentenceTransformerEmbeddingFunction(
-                model_name="all-MiniLM-L6-v2",
-                device="cpu"
-            )
+            self.embeddings = _get_embeddings()
             
             # Initialize vector store with collection name
-            self.vector_store = Chroma(
-                persist_directory=str(self.memory_path),
-                embedding_function=self.embeddings,
-                collection_name="chat_memory"
-            )
+            self.vector_store = _get_vector_store(str(self.memory_path))
             
             # Initialize conversation memory
             self.memory = ChatMessageHistory()
@@ -151,16 +181,14 @@ class MemoryManager:
     def _save_json(self, path: Path, data: Any):
         """Save data to JSON file with error handling."""
         try:
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            path.write_bytes(_json_dumps(data, indent=True))
         except Exception as e:
             logging.error(f"Error saving to {path}: {str(e)}")
             
     def _load_json(self, path: Path) -> Any:
         """Load data from JSON file with error handling."""
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            return _json_loads(path.read_bytes())
         except Exception as e:
             logging.error(f"Error loading from {path}: {str(e)}")
             return None
@@ -330,18 +358,11 @@ class MemoryManager:
         """Set up the vector store for semantic search."""
         try:
             # Initialize embeddings
-            self.embeddings = SentenceTransformerEmbeddingFunction(
-                model_name="all-MiniLM-L6-v2",
-                device="cpu"
-            )
+            self.embeddings = _get_embeddings()
             
             # Set up Chroma store
             persist_directory = str(self.data_dir / "vector_store")
-            return Chroma(
-                persist_directory=persist_directory,
-                embedding_function=self.embeddings,
-                collection_name="chat_memory"
-            )
+            return _get_vector_store(persist_directory)
             
         except Exception as e:
             logging.error(f"Failed to setup vector store: {str(e)}")
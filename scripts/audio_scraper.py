@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 
 import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from tqdm import tqdm
 from aiohttp import ClientSession
 
@@ -28,6 +28,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class AudioScraper:
+    # Date formats recognised in audio descriptions, tried in order
+    _DATE_PATTERNS = [
+        re.compile(r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}'),
+        re.compile(r'\d{4}-\d{2}-\d{2}'),
+        re.compile(r'\d{2}/\d{2}/\d{4}')
+    ]
+    _UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+    # Only links are needed from the fallback page parse
+    _LINK_STRAINER = SoupStrainer('a', href=True)
+    
     def __init__(self, base_dir: str = "audio_scrapes"):
         self.base_dir = Path(base_dir)
         self.firecrawl_api_key = os.getenv('FIRECRAWL_API_KEY')
@@ -50,19 +60,13 @@ class AudioScraper:
         return url.lower().endswith(audio_extensions)
     
     def _sanitize_filename(self, filename: str) -> str:
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+        filename = self._UNSAFE_FILENAME_CHARS.sub('', filename)
         filename = filename.replace(' ', '_')
         return filename.lower()
     
     def _extract_date(self, text: str) -> Optional[str]:
-        date_patterns = [
-            r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}',
-            r'\d{4}-\d{2}-\d{2}',
-            r'\d{2}/\d{2}/\d{4}'
-        ]
-        
-        for pattern in date_patterns:
-            if match := re.search(pattern, text):
+        for pattern in self._DATE_PATTERNS:
+            if match := pattern.search(text):
                 return match.group()
         return None
     
@@ -204,9 +208,9 @@ class AudioScraper:
                 logger.info("Falling back to traditional scraping method")
                 response = self.session.get(url)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text, 'lxml', parse_only=self._LINK_STRAINER)
                 
-                for link in soup.find_all('a', href=True):
+                for link in soup.find_all('a'):
                     href = link.get('href')
                     full_url = urljoin(url, href)
                     if self._is_audio_link(full_url):
@@ -2,20 +2,38 @@
 
 import os
 import re
+import gzip
+import hashlib
+import importlib.util
 import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+import random
 import asyncio
+import argparse
 import logging
-import sys
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set, Any
-from urllib.parse import urljoin, urlparse
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Set, Any, Union
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from dotenv import load_dotenv
 import aiohttp
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup
-import requests
-from firecrawl import FirecrawlApp
+from aiohttp import ClientResponse, ClientSession
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding and decoding
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional: smaller, faster HTML cache compression
+    zstandard = None
+
+if TYPE_CHECKING:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode as Node
 
 # Load environment variables
 load_dotenv()
@@ -27,21 +45,155 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# aiohttp speedups: aiodns for asynchronous DNS, Brotli for br-encoded responses
+_HAS_AIODNS = importlib.util.find_spec('aiodns') is not None
+_HAS_BROTLI = any(importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi'))
+if not (_HAS_AIODNS and _HAS_BROTLI):
+    logger.warning("aiohttp speedups not installed; run `pip install aiohttp[speedups]` for faster fetching")
+
+# Upper bound on the body size read for a single page
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+
+# Maximum number of in-flight requests to any single host
+MAX_REQUESTS_PER_HOST = 4
+
+# Seconds a cached page stays fresh before it is fetched again
+HTML_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Number of completed sections between crawl checkpoint writes
+CHECKPOINT_EVERY = 10
+
+# Retries for transient HTTP failures, with exponential backoff capped at
+# MAX_RETRY_DELAY seconds
+MAX_RETRIES = 4
+MAX_RETRY_DELAY = 30
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# URL classification patterns (matched against the lower-cased URL)
+_TEXT_RE = re.compile(r'/article/|/blog/|/post/|/book/|\.txt|\.pdf|\.docx?|\.epub')
+# Alternatives are tried in order from the start of the URL, so earlier
+# content types take precedence when a URL matches several of them.
+_CTYPE_RE = re.compile(
+    r'^(?:'
+    r'(?=.*(?:/article/|/news/))(?P<articles>)'
+    r'|(?=.*(?:/blog/|/post/))(?P<blog_posts>)'
+    r'|(?=.*(?:/book/|\.pdf$|\.epub$))(?P<books>)'
+    r')'
+)
+
+# Text and filename cleanup
+_WS_RE = re.compile(r'\s+')
+_SPECIAL_RE = re.compile(r'[^\w\s.,!?-]')
+_FILENAME_STRIP = re.compile(r'[^\w\s-]')
+_FILENAME_COLLAPSE = re.compile(r'[-\s]+')
+
+# Word tokens for the cached-content index
+_TOKEN_RE = re.compile(r'\w+')
+
+# Content quality indicators, scanned in a single pass: punctuation,
+# excessive spacing, and a capitalized word
+_QUAL_RE = re.compile(r'([.,!?])|(\s{3,})|([A-Z][a-z])')
+_QUAL_ALL = 0b111
+
+# Markdown heading levels by tag name
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# CSS selectors for navigation and content containers, matched by Lexbor.
+# Navigation selectors are tried in order: class, then id, then ARIA role.
+_NAV_WORDS = ('nav', 'menu', 'toc', 'contents', 'chapters')
+_NAV_SELECTORS = [
+    ':is(nav, div, ul):is({})'.format(', '.join(f'[{attr}*="{word}" i]' for word in _NAV_WORDS))
+    for attr in ('class', 'id')
+] + [':is(nav, div, ul)[role="navigation"]']
+_CONTENT_SELECTOR = (
+    ':is(article, main, div)'
+    ':is([class*="content"], [class*="article"], [class*="post"], [class*="text"])'
+)
+_CHAPTER_SELECTOR = (
+    ':is(article, main, div)'
+    ':is([class*="content"], [class*="chapter"], [class*="text"], [class*="body"])'
+)
+
+# The HTML parser is imported on first parse so `--help` and argument errors
+# return without loading it
+_LexborHTMLParser = None
+
+def _parse_html(html: Union[str, bytes]) -> 'LexborHTMLParser':
+    """Parse an HTML document with selectolax's Lexbor backend.
+
+    UTF-8 bytes are parsed as-is, without an intermediate str copy.
+    """
+    global _LexborHTMLParser
+    if _LexborHTMLParser is None:
+        from selectolax.lexbor import LexborHTMLParser as _LexborHTMLParser
+    return _LexborHTMLParser(html)
+
+def _canon(url: str) -> str:
+    """Normalize a URL for duplicate detection by dropping its fragment and trailing slash."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+def _dump_json(obj: Any, indent: bool = True) -> bytes:
+    """Serialize an object to UTF-8 JSON, preferring orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def _compress(data: bytes) -> bytes:
+    """Compress cached HTML with zstandard when installed, gzip otherwise."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(data: bytes) -> bytes:
+    """Reverse _compress."""
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+# Cached HTML files are named after the codec so switching codecs never
+# reads a file with the wrong one
+_HTML_CACHE_SUFFIX = '.html.zst' if zstandard is not None else '.html.gz'
+
+def _load_json(data: bytes) -> Any:
+    """Deserialize UTF-8 JSON, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class TextScraper:
-    def __init__(self, base_dir: str = "text_scrapes"):
+    def __init__(self, base_dir: str = "text_scrapes", single_file: bool = False,
+                 use_cache: bool = True):
         self.base_dir = Path(base_dir)
+        # Write every chapter of a crawled book into one markdown file
+        self.single_file = single_file
+        # Serve FireCrawl pages from the on-disk HTML cache while fresh; when
+        # off, every page is fetched again and its cache entry replaced
+        self.use_cache = use_cache
+        # Worker processes for HTML parsing, started by initialize()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Chapter markdown waiting to be written to its book file, keyed by URL
+        self._chapters: Dict[str, bytes] = {}
+        # Per-host request limits, keyed by network location
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        # Canonical URLs already claimed by the current crawl
+        self._visited: Set[str] = set()
         self.firecrawl_api_key = os.getenv('FIRECRAWL_API_KEY')
         if not self.firecrawl_api_key:
             raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
             
-        # Initialize FireCrawl SDK
+        # Initialize FireCrawl SDK (imported here as it pulls in a large dependency tree)
+        from firecrawl import FirecrawlApp
         self.firecrawl = FirecrawlApp(api_key=self.firecrawl_api_key)
         
-        # Initialize regular session for fallback
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Default headers for direct (non-FireCrawl) requests
+        self._headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'br, gzip, deflate' if _HAS_BROTLI else 'gzip, deflate'
+        }
         
         # Create necessary directories
         self.base_dir.mkdir(exist_ok=True)
@@ -92,24 +244,70 @@ class TextScraper:
     async def initialize(self):
         """Initialize the text scraper."""
         try:
-            # Initialize aiohttp session
-            self.aio_session = aiohttp.ClientSession()
+            # Worker processes for HTML parsing. They are not forked, since
+            # by now this process may already be running resolver and
+            # to_thread worker threads.
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context(start_method)
+            )
+            
+            # Initialize the aiohttp session shared by all requests, so
+            # connections, DNS lookups and TLS sessions are reused
+            self._connector = self._make_connector()
+            self.aio_session = aiohttp.ClientSession(
+                headers=self._headers,
+                connector=self._connector
+            )
             
             # Initialize cache directory
             self.cache_dir = Path("./data/scraper_cache")
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.html_cache_dir = self.cache_dir / "html"
+            self.html_cache_dir.mkdir(exist_ok=True)
             
             # Load any cached data
             self.url_cache = {}
             self.quality_scores = {}
+            # Lower-cased word -> URLs of cached content containing it
+            self._inv_index: Dict[str, Dict[str, None]] = defaultdict(dict)
             self._load_cache()
             
+            # Sections finished by an interrupted crawl, keyed by URL
+            self.checkpoint_path = self.cache_dir / "crawl_ckpt.json"
+            self._crawl_done: Dict[str, Dict] = {}
+            self._ckpt_pending = 0
+            self._ckpt_lock = asyncio.Lock()
+            self._crawl_failures = 0
+            self._load_checkpoint()
+            
             logging.info("Text scraper initialized successfully")
             
         except Exception as e:
             logging.error(f"Failed to initialize text scraper: {str(e)}")
             raise
 
+    def _make_connector(self) -> aiohttp.TCPConnector:
+        """Create a pooled connector with a DNS cache, resolving through aiodns when available."""
+        resolver = aiohttp.AsyncResolver() if _HAS_AIODNS else None
+        return aiohttp.TCPConnector(
+            resolver=resolver,
+            limit=100,
+            limit_per_host=MAX_REQUESTS_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=30
+        )
+    
+    def _sem_for(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent requests to the URL's host."""
+        host = urlparse(url).netloc
+        semaphore = self._host_sems.get(host)
+        if semaphore is None:
+            semaphore = self._host_sems[host] = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+        return semaphore
+    
     async def cleanup(self):
         """Cleanup resources."""
         try:
@@ -121,9 +319,15 @@ class TextScraper:
                 except Exception as e:
                     logging.error(f"Error closing session: {str(e)}")
             
+            if self._pool is not None:
+                await asyncio.to_thread(self._pool.shutdown, cancel_futures=True)
+                self._pool = None
+            
             # Save any pending cache updates
             try:
                 await self._save_cache()
+                if self._ckpt_pending:
+                    await self._flush_checkpoint()
             except Exception as e:
                 logging.error(f"Error saving cache during cleanup: {str(e)}")
                 
@@ -137,42 +341,75 @@ class TextScraper:
         try:
             cache_file = self.cache_dir / "url_cache.json"
             if cache_file.exists():
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                    self.url_cache = cached_data.get('urls', {})
-                    self.quality_scores = cached_data.get('scores', {})
+                cached_data = _load_json(cache_file.read_bytes())
+                self.url_cache = cached_data.get('urls', {})
+                self.quality_scores = cached_data.get('scores', {})
+                for url, content in self.url_cache.items():
+                    self._index_content(url, content)
         except Exception as e:
             logging.warning(f"Failed to load scraper cache: {str(e)}")
 
+    def _load_checkpoint(self):
+        """Load the sections completed by a previous, interrupted crawl."""
+        try:
+            if self.checkpoint_path.exists():
+                self._crawl_done = _load_json(self.checkpoint_path.read_bytes())
+                logging.info(f"Resuming crawl with {len(self._crawl_done)} completed sections")
+        except Exception as e:
+            logging.warning(f"Failed to load crawl checkpoint: {str(e)}")
+
+    async def _flush_checkpoint(self):
+        """Write the completed sections to the checkpoint file."""
+        async with self._ckpt_lock:
+            self._ckpt_pending = 0
+            data = _dump_json(self._crawl_done, indent=False)
+            await asyncio.to_thread(self.checkpoint_path.write_bytes, data)
+
+    async def _clear_checkpoint(self, url: str):
+        """Drop the checkpointed sections of a crawl that has completed."""
+        self._crawl_done = {
+            section_url: section_data for section_url, section_data in self._crawl_done.items()
+            if not section_url.startswith(url)
+        }
+        if self._crawl_done:
+            await self._flush_checkpoint()
+        else:
+            self._ckpt_pending = 0
+            self.checkpoint_path.unlink(missing_ok=True)
+
+    def _index_content(self, url: str, content: str):
+        """Add a cached document's words to the search index."""
+        for token in set(_TOKEN_RE.findall(content.lower())):
+            self._inv_index[token][url] = None
+
     async def _save_cache(self):
         """Save cache to disk."""
         try:
             cache_file = self.cache_dir / "url_cache.json"
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'urls': self.url_cache,
-                    'scores': self.quality_scores
-                }, f)
+            # Serialize on the loop so the snapshot is consistent, write off it
+            data = _dump_json({
+                'urls': self.url_cache,
+                'scores': self.quality_scores
+            }, indent=False)
+            await asyncio.to_thread(cache_file.write_bytes, data)
         except Exception as e:
             logging.warning(f"Failed to save scraper cache: {str(e)}")
 
     def _is_text_content(self, url: str) -> bool:
         """Check if URL potentially contains text content."""
-        text_indicators = [
-            '/article/', '/blog/', '/post/', '/book/',
-            '.txt', '.pdf', '.doc', '.docx', '.epub'
-        ]
-        return any(indicator in url.lower() for indicator in text_indicators)
+        return bool(_TEXT_RE.search(url.lower()))
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """Clean extracted text content."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         # Remove special characters
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
+        text = _SPECIAL_RE.sub('', text)
         return text.strip()
     
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict:
+    @staticmethod
+    def _extract_metadata(tree: 'LexborHTMLParser', url: str) -> Dict:
         """Extract metadata from the webpage."""
         metadata = {
             'url': url,
@@ -184,81 +421,140 @@ class TextScraper:
         }
         
         # Try to extract title
-        title_tag = soup.find('meta', property='og:title') or soup.find('title')
+        title_tag = tree.css_first('meta[property="og:title"]') or tree.css_first('title')
         if title_tag:
-            metadata['title'] = title_tag.get('content', '') or title_tag.string
+            metadata['title'] = title_tag.attributes.get('content') or title_tag.text()
             
         # Try to extract author
-        author_tag = soup.find('meta', property='author') or soup.find('meta', name='author')
+        author_tag = tree.css_first('meta[property="author"]') or tree.css_first('meta[name="author"]')
         if author_tag:
-            metadata['author'] = author_tag.get('content', '')
+            metadata['author'] = author_tag.attributes.get('content') or ''
             
         # Try to extract publication date
-        date_tag = soup.find('meta', property='article:published_time')
+        date_tag = tree.css_first('meta[property="article:published_time"]')
         if date_tag:
-            metadata['date_published'] = date_tag.get('content', '')
+            metadata['date_published'] = date_tag.attributes.get('content') or ''
             
         # Determine content type
-        if '/article/' in url or '/news/' in url:
-            metadata['content_type'] = 'articles'
-        elif '/blog/' in url or '/post/' in url:
-            metadata['content_type'] = 'blog_posts'
-        elif '/book/' in url or url.endswith(('.pdf', '.epub')):
-            metadata['content_type'] = 'books'
-        else:
-            metadata['content_type'] = 'articles'  # default
+        match = _CTYPE_RE.match(url.lower())
+        metadata['content_type'] = match.lastgroup if match else 'articles'  # default
             
         return metadata
     
     async def _download_text(self, session: ClientSession, url: str) -> Tuple[str, Dict]:
         """Download and extract text content from a URL."""
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to download {url}: Status {response.status}")
-                    return None, None
-                    
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract main content
-                # Remove script and style elements
-                for element in soup(['script', 'style', 'nav', 'header', 'footer']):
-                    element.decompose()
-                
-                # Extract text from main content areas
-                content_tags = soup.find_all(['article', 'main', 'div'], class_=re.compile(r'content|article|post|text'))
-                if not content_tags:
-                    content_tags = [soup.body] if soup.body else [soup]
-                
-                text_content = []
-                for tag in content_tags:
-                    text_content.append(tag.get_text())
-                
-                text = ' '.join(text_content)
-                cleaned_text = self._clean_text(text)
-                
-                # Extract metadata
-                metadata = self._extract_metadata(soup, url)
-                
-                return cleaned_text, metadata
+            html = await self._fetch_html(session, url)
+            if html is None:
+                return None, None
+            
+            return await self._run_in_pool(_parse_html_worker, html, url)
                 
         except Exception as e:
             logger.error(f"Error downloading {url}: {str(e)}")
             return None, None
     
-    async def get_content_with_firecrawl(self, url: str) -> Optional[str]:
+    async def _run_in_pool(self, func: Callable, *args: Any) -> Any:
+        """Run a module-level function in the process pool, or inline before initialize().
+
+        Parsing is CPU-bound, so it runs in a worker process when the pool is
+        up to keep the event loop free for network I/O.
+        """
+        if self._pool is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, func, *args)
+    
+    async def _fetch_html(self, session: ClientSession, url: str) -> Optional[Union[str, bytes]]:
+        """GET a page body, retrying rate limits, server errors and connection failures.
+
+        Returns None for other error statuses and for bodies _read_html
+        rejects; the last connection error is re-raised once retries run out.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                async with self._sem_for(url), session.get(url) as response:
+                    if response.status == 200:
+                        return await self._read_html(response)
+                    if response.status not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+                        logger.error(f"Failed to download {url}: Status {response.status}")
+                        return None
+                    retry_after = response.headers.get('Retry-After')
+                    logger.warning(f"Retrying {url} after status {response.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning(f"Retrying {url} after error: {str(e)}")
+            
+            # Back off outside the host semaphore so other requests can proceed
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+    
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before a retry, honouring a numeric Retry-After header."""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 2 ** attempt
+        return min(MAX_RETRY_DELAY, delay) + random.random()
+    
+    async def _read_html(self, response: ClientResponse) -> Optional[Union[str, bytes]]:
+        """Read an HTML/text response body, bounded by MAX_DOWNLOAD_BYTES.
+
+        Returns None for non-text content types and for bodies that declare a
+        larger Content-Length; bodies without one are truncated at the limit.
+        UTF-8 bodies are returned as raw bytes for _parse_html, other charsets
+        are decoded to str.
+        """
+        content_type = response.headers.get('Content-Type', '').lower()
+        if content_type and 'html' not in content_type and 'text' not in content_type:
+            logger.warning(f"Skipping {response.url}: unsupported content type {content_type}")
+            return None
+        
+        content_length = int(response.headers.get('Content-Length') or 0)
+        if content_length > MAX_DOWNLOAD_BYTES:
+            logger.warning(f"Skipping {response.url}: {content_length} bytes exceeds download limit")
+            return None
+        
+        chunks = []
+        remaining = MAX_DOWNLOAD_BYTES
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            if len(chunk) > remaining:
+                logger.warning(f"Truncating {response.url} at {MAX_DOWNLOAD_BYTES} bytes")
+                chunks.append(chunk[:remaining])
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        body = b''.join(chunks)
+        
+        charset = (response.charset or 'utf-8').lower()
+        if charset in ('utf-8', 'utf8'):
+            return body
+        return body.decode(charset, 'replace')
+    
+    async def get_content_with_firecrawl(self, url: str) -> Optional[Union[str, bytes]]:
         """Get content using FireCrawl SDK with fallback to direct requests."""
+        if self.use_cache:
+            cached = await self._load_cached_html(url)
+            if cached is not None:
+                logger.info(f"Using cached content for {url}")
+                return cached
+        
         try:
             logger.info("Attempting to scrape with FireCrawl...")
-            # Use FireCrawl's scrape_url method with minimal parameters
-            result = self.firecrawl.scrape_url(
-                url,
-                params={'formats': ['html']}
-            )
+            # Use FireCrawl's scrape_url method with minimal parameters. The SDK
+            # is synchronous, so run it in a worker thread to keep the loop free.
+            async with self._sem_for(url):
+                result = await asyncio.to_thread(
+                    self.firecrawl.scrape_url,
+                    url,
+                    params={'formats': ['html']}
+                )
             
             if result and 'html' in result:
                 logger.info("Successfully retrieved content using FireCrawl")
+                await self._cache_html(url, result['html'])
                 return result['html']
             
             logger.warning("FireCrawl returned no HTML content")
@@ -270,35 +566,85 @@ class TextScraper:
             
             # Fallback to direct request
             try:
-                async with aiohttp.ClientSession(headers=self.session.headers) as session:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            logger.error(f"Failed to access {url}: Status {response.status}")
-                            return None
-                        html_content = await response.text()
-                        logger.info("Successfully retrieved content using direct request")
-                        return html_content
+                html_content = await self._fetch_html(self.aio_session, url)
+                if html_content is None:
+                    return None
+                logger.info("Successfully retrieved content using direct request")
+                return html_content
             except Exception as direct_error:
                 logger.error(f"Direct request error: {str(direct_error)}")
                 return None
 
+    def _html_cache_path(self, url: str) -> Path:
+        """Get the cache file for a page's HTML."""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.html_cache_dir / f"{key}{_HTML_CACHE_SUFFIX}"
+    
+    async def _load_cached_html(self, url: str) -> Optional[bytes]:
+        """Return a page's cached UTF-8 HTML if it is younger than HTML_CACHE_TTL.
+
+        Expired entries are deleted when they are found.
+        """
+        path = self._html_cache_path(url)
+        
+        def load() -> Optional[bytes]:
+            try:
+                if time.time() - path.stat().st_mtime > HTML_CACHE_TTL:
+                    path.unlink(missing_ok=True)
+                    return None
+                return _decompress(path.read_bytes())
+            except FileNotFoundError:
+                return None
+        
+        try:
+            return await asyncio.to_thread(load)
+        except Exception as e:
+            logger.warning(f"Failed to read cached content for {url}: {str(e)}")
+            return None
+    
+    async def _cache_html(self, url: str, html: Union[str, bytes]):
+        """Store a page's HTML in the on-disk cache."""
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        path = self._html_cache_path(url)
+        
+        def store():
+            path.write_bytes(_compress(html))
+        
+        try:
+            await asyncio.to_thread(store)
+        except Exception as e:
+            logger.warning(f"Failed to cache content for {url}: {str(e)}")
+    
     async def scrape_urls(self, urls: List[str], max_concurrent: int = 5):
-        """Scrape multiple URLs concurrently."""
-        async with aiohttp.ClientSession(headers=self.session.headers) as session:
-            tasks = []
-            for url in urls:
-                if self._is_text_content(url):
-                    tasks.append(self._download_text(session, url))
-                
-            results = []
-            for future in asyncio.as_completed(tasks):
-                text, metadata = await future
+        """Scrape multiple URLs concurrently, at most max_concurrent at a time."""
+        queue: asyncio.Queue = asyncio.Queue()
+        seen = set()
+        for url in urls:
+            canonical = _canon(url)
+            if canonical not in seen and self._is_text_content(url):
+                seen.add(canonical)
+                queue.put_nowait(url)
+        
+        results = []
+        
+        async def worker():
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                text, metadata = await self._download_text(self.aio_session, url)
                 if text and metadata:
                     results.append((text, metadata))
-            
-            return results
+        
+        # A fixed pool of workers drains the queue, so only max_concurrent
+        # downloads exist at any time regardless of how many URLs are given
+        await asyncio.gather(*[worker() for _ in range(min(max_concurrent, queue.qsize()))])
+        
+        return results
     
-    def save_content(self, text: str, metadata: Dict):
+    async def save_content(self, text: str, metadata: Dict):
         """Save scraped content and metadata."""
         try:
             content_type = metadata.get('content_type', 'articles')
@@ -310,18 +656,15 @@ class TextScraper:
                 title = urlparse(metadata['url']).path.split('/')[-1]
             
             # Clean filename
-            filename = re.sub(r'[^\w\s-]', '', title).strip().lower()
-            filename = re.sub(r'[-\s]+', '-', filename)
+            filename = self._clean_filename(title)
             
             # Save text content
             text_path = content_dir / f"{filename}.txt"
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            await asyncio.to_thread(text_path.write_bytes, text.encode('utf-8'))
             
             # Save metadata
             metadata_path = self.metadata_dir / f"{filename}.json"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            await asyncio.to_thread(metadata_path.write_bytes, _dump_json(metadata))
                 
             logger.info(f"Saved content to {text_path}")
             return text_path
@@ -341,19 +684,27 @@ class TextScraper:
                 logger.error("Failed to retrieve content")
                 return None
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Try to get content title
-            title = self._extract_title(soup, url)
+            title, sections, content = await self._run_in_pool(_crawl_page_worker, html_content, url)
             logger.info(f"Found title: {title}")
             
-            if not base_path:
+            is_root = base_path is None
+            if is_root:
+                self._crawl_failures = 0
+                self._visited = {_canon(url)}
+                self._chapters.clear()
                 base_path = self.content_dirs['books'] / self._clean_filename(title)
-                base_path.mkdir(exist_ok=True)
+                base_path.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Created directory: {base_path}")
             
-            # Look for nested sections/chapters
-            sections = self._find_nested_sections(soup, url)
+            # Skip sections linked more than once, or already claimed
+            # elsewhere in this crawl
+            unique_sections = []
+            for section_title, section_url in sections:
+                canonical = _canon(section_url)
+                if canonical not in self._visited:
+                    self._visited.add(canonical)
+                    unique_sections.append((section_title, section_url))
+            sections = unique_sections
             
             if sections:
                 logger.info(f"Found {len(sections)} sections to process")
@@ -365,29 +716,41 @@ class TextScraper:
                     'scraped_at': datetime.now().isoformat()
                 }
                 
-                # Process each section
-                for section_num, (section_title, section_url) in enumerate(sections, 1):
-                    logger.info(f"Processing section {section_num}/{len(sections)}: {section_title}")
-                    section_path = base_path / f"{section_num:03d}_{self._clean_filename(section_title)}"
-                    section_path.mkdir(exist_ok=True)
-                    
-                    # Add a small delay between requests
-                    if section_num > 1:
-                        await asyncio.sleep(1)
-                    
-                    section_data = await self.crawl_nested_content(section_url, section_path)
-                    if section_data:
-                        metadata['sections'].append(section_data)
-                        logger.info(f"Successfully processed section {section_num}/{len(sections)}")
-                    else:
-                        logger.warning(f"Failed to process section {section_num}/{len(sections)}")
+                # Lay out all section directories up front; single-file mode
+                # writes the whole book next to the root directory instead
+                section_paths = [
+                    base_path / f"{section_num:03d}_{self._clean_filename(section_title)}"
+                    for section_num, (section_title, _) in enumerate(sections, 1)
+                ]
+                if not self.single_file:
+                    for section_path in section_paths:
+                        section_path.mkdir(exist_ok=True)
+                
+                # Process all sections concurrently; results come back in section order
+                results = await asyncio.gather(*[
+                    self._crawl_one_section(section_num, len(sections), section_title,
+                                            section_url, section_path)
+                    for section_num, ((section_title, section_url), section_path) in enumerate(
+                        zip(sections, section_paths), 1)
+                ])
+                metadata['sections'] = [section_data for section_data in results if section_data]
                 
                 logger.info(f"Completed processing all {len(sections)} sections")
                 
+                if self.single_file and is_root:
+                    await asyncio.to_thread(
+                        self._write_book,
+                        base_path / f"{self._clean_filename(title)}.md",
+                        metadata
+                    )
+                
             else:
                 # This is a content page
                 logger.info("Processing content page...")
-                content = self._extract_chapter_content(soup)
+                if content is None:
+                    # Every section link was already claimed, so the page is
+                    # read as content after all
+                    content = await self._run_in_pool(_chapter_content_worker, html_content)
                 
                 if not content:
                     logger.error("Failed to extract content from page")
@@ -400,43 +763,118 @@ class TextScraper:
                     'scraped_at': datetime.now().isoformat()
                 }
                 
-                # Save content as markdown
-                markdown_content = self._format_markdown(title, url, content)
-                file_path = base_path / f"{self._clean_filename(title)}.md"
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-                
-                metadata['file_path'] = str(file_path.relative_to(self.base_dir))
-                logger.info(f"Saved content to {file_path}")
+                if self.single_file and not is_root:
+                    # Written in section order by the root page once the crawl
+                    # completes, under the book's frontmatter
+                    self._chapters[url] = self._format_chapter(title, content)
+                else:
+                    # Save content as markdown
+                    markdown_content = self._format_markdown(title, url, content)
+                    file_path = base_path / f"{self._clean_filename(title)}.md"
+                    
+                    await asyncio.to_thread(file_path.write_bytes, markdown_content)
+                    
+                    metadata['file_path'] = str(file_path.relative_to(self.base_dir))
+                    logger.info(f"Saved content to {file_path}")
             
             # Save metadata
             metadata_path = self.metadata_dir / f"{self._clean_filename(title)}.json"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            await asyncio.to_thread(metadata_path.write_bytes, _dump_json(metadata))
             
             logger.info(f"Saved metadata to {metadata_path}")
+            
+            # Keep the checkpoint after a partial crawl so a re-run only
+            # fetches what is missing. Single-file crawls neither use nor
+            # clear it, since their chapters cannot be restored from it.
+            if not self.single_file and is_root and self._crawl_done and not self._crawl_failures:
+                await self._clear_checkpoint(url)
+            elif not self.single_file and is_root and self._ckpt_pending:
+                await self._flush_checkpoint()
             return metadata
             
         except Exception as e:
             logger.error(f"Error crawling {url}: {str(e)}")
             return None
     
-    def _extract_title(self, soup: BeautifulSoup, url: str) -> str:
+    async def _crawl_one_section(self, section_num: int, total: int, section_title: str,
+                                 section_url: str, section_path: Path) -> Dict:
+        """Crawl a single section of a nested content page."""
+        # Checkpointed sections carry metadata only, while a single-file book
+        # needs every chapter's markdown, so single-file crawls fetch them all
+        if not self.single_file and section_url in self._crawl_done:
+            logger.info(f"Skipping section {section_num}/{total}, already crawled: {section_title}")
+            return self._crawl_done[section_url]
+        
+        logger.info(f"Processing section {section_num}/{total}: {section_title}")
+        
+        # Stagger the start of each request; the per-host semaphore taken
+        # around each fetch bounds how many run against the site at once
+        await asyncio.sleep(random.uniform(0.2, 1.0))
+        
+        section_data = await self.crawl_nested_content(section_url, section_path)
+        if section_data:
+            logger.info(f"Successfully processed section {section_num}/{total}")
+            # Only content pages are recorded, so containers are re-read and
+            # pick up any of their sections that failed
+            if section_data['type'] == 'content' and not self.single_file:
+                self._crawl_done[section_url] = section_data
+                self._ckpt_pending += 1
+                if self._ckpt_pending >= CHECKPOINT_EVERY:
+                    await self._flush_checkpoint()
+        else:
+            logger.warning(f"Failed to process section {section_num}/{total}")
+            self._crawl_failures += 1
+        return section_data
+    
+    def _write_book(self, book_path: Path, metadata: Dict):
+        """Write the pending chapters of a crawled book into one markdown file.
+
+        The file opens with the book's frontmatter; each content section's
+        metadata keeps its source URL and records the book file and the byte
+        offset at which its chapter starts.
+        """
+        relative_path = str(book_path.relative_to(self.base_dir))
+        with open(book_path, 'wb') as f:
+            f.write(self._format_frontmatter(metadata['title'], metadata['url']))
+            body_start = f.tell()
+            for section in self._iter_content_sections(metadata):
+                chapter = self._chapters.pop(section['url'], None)
+                if chapter is None:
+                    logger.warning(f"No content for chapter {section['url']}, leaving it out of the book")
+                    continue
+                if f.tell() > body_start:
+                    f.write(b'\n\n---\n\n')
+                section['file_path'] = relative_path
+                section['offset'] = f.tell()
+                f.write(chapter)
+        
+        metadata['file_path'] = relative_path
+        logger.info(f"Saved book to {book_path}")
+    
+    def _iter_content_sections(self, metadata: Dict):
+        """Yield content sections of a crawl metadata tree in reading order."""
+        for section in metadata.get('sections', []):
+            if section.get('type') == 'content':
+                yield section
+            else:
+                yield from self._iter_content_sections(section)
+    
+    @staticmethod
+    def _extract_title(tree: 'LexborHTMLParser', url: str) -> str:
         """Extract title from the page."""
         # Try multiple title patterns
         title = None
         patterns = [
-            ('h1', {}),
-            ('title', {}),
-            ('meta', {'property': 'og:title'}),
-            ('div', {'class': 'title'}),
+            'h1',
+            'title',
+            'meta[property="og:title"]',
+            'div.title',
         ]
         
-        for tag, attrs in patterns:
-            element = soup.find(tag, attrs)
-            if element:
-                title = element.get('content', '') if tag == 'meta' else element.get_text()
+        for selector in patterns:
+            node = tree.css_first(selector)
+            if node:
+                title = (node.attributes.get('content') or '') if node.tag == 'meta' else node.text()
                 if title:
                     break
         
@@ -446,108 +884,145 @@ class TextScraper:
         
         return title.strip()
     
-    def _find_nested_sections(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    @staticmethod
+    def _find_nested_sections(tree: 'LexborHTMLParser', base_url: str) -> List[Tuple[str, str]]:
         """Find nested sections or chapters in the page."""
         sections = []
         
-        # Common patterns for navigation/content links
-        nav_patterns = [
-            {'class_': re.compile(r'nav|menu|toc|contents|chapters', re.I)},
-            {'id': re.compile(r'nav|menu|toc|contents|chapters', re.I)},
-            {'role': 'navigation'}
-        ]
-        
         # Try to find navigation container
-        for pattern in nav_patterns:
-            nav = soup.find(['nav', 'div', 'ul'], pattern)
-            if nav:
+        nav = None
+        for selector in _NAV_SELECTORS:
+            nav = tree.css_first(selector)
+            if nav is not None:
                 break
         
-        if not nav:
-            nav = soup  # Fall back to entire page if no nav found
+        if nav is None:
+            nav = tree.root  # Fall back to entire page if no nav found
+        
+        # Split the base URL once so the common link shapes can be resolved
+        # with plain string prefix checks instead of a urljoin per link
+        parsed_base = urlparse(base_url)
+        origin = f"{parsed_base.scheme}://{parsed_base.netloc}"
+        base_path = base_url[len(origin):] if base_url.startswith(origin) else None
         
         # Find all links that might be sections
-        for link in nav.find_all('a', href=True):
-            href = link['href']
-            if href.startswith(('#', 'javascript:')):
+        for link in nav.css('a[href]'):
+            href = link.attributes.get('href') or ''
+            if not href or href.startswith(('#', 'javascript:', 'mailto:')):
                 continue
-                
-            url = urljoin(base_url, href)
-            if url.startswith(base_url):  # Only include links from same domain
-                title = link.get_text().strip()
-                if title:
-                    sections.append((title, url))
+            
+            if (base_path is not None and href.startswith('/') and not href.startswith('//')
+                    and '/.' not in href):
+                # Root-relative link without dot segments, which would need
+                # urljoin to resolve them before the prefix check
+                if not href.startswith(base_path):
+                    continue
+                url = origin + href
+            elif href.startswith(('http://', 'https://')):
+                if not href.startswith(base_url):
+                    continue
+                url = href
+            else:
+                url = urljoin(base_url, href)
+                if not url.startswith(base_url):
+                    continue
+            
+            # Only links under the base URL are treated as sections
+            title = link.text().strip()
+            if title:
+                sections.append((title, url))
         
         return sections
     
-    def _extract_chapter_content(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _extract_chapter_content(tree: 'LexborHTMLParser') -> str:
         """Extract the main content from a chapter page and format as markdown."""
         # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-            element.decompose()
+        tree.strip_tags(['script', 'style', 'nav', 'header', 'footer', 'aside'], recursive=True)
         
         # Try to find the main content container
-        content_containers = soup.find_all(
-            ['article', 'main', 'div'], 
-            class_=re.compile(r'content|chapter|text|body')
-        )
+        content_containers = tree.css(_CHAPTER_SELECTOR)
         
         if not content_containers:
-            content_containers = [soup.body] if soup.body else [soup]
+            content_containers = [tree.body] if tree.body else [tree.root]
         
         markdown_content = []
         for container in content_containers:
-            # Convert HTML elements to Markdown
-            for h in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                level = int(h.name[1])
-                h.replace_with(f"\n{'#' * level} {h.get_text().strip()}\n")
-            
-            for p in container.find_all('p'):
-                p.replace_with(f"\n{p.get_text().strip()}\n")
-            
-            for ul in container.find_all('ul'):
-                for li in ul.find_all('li'):
-                    li.replace_with(f"* {li.get_text().strip()}\n")
-            
-            for ol in container.find_all('ol'):
-                for i, li in enumerate(ol.find_all('li'), 1):
-                    li.replace_with(f"{i}. {li.get_text().strip()}\n")
-            
-            for quote in container.find_all('blockquote'):
-                lines = quote.get_text().strip().split('\n')
-                quote.replace_with('\n'.join(f"> {line.strip()}" for line in lines if line.strip()))
-            
-            for em in container.find_all('em'):
-                em.replace_with(f"_{em.get_text().strip()}_")
-            
-            for strong in container.find_all('strong'):
-                strong.replace_with(f"**{strong.get_text().strip()}**")
-            
-            # Get the text and clean it
-            text = container.get_text('\n', strip=True)
-            if text:
-                markdown_content.append(text)
+            # Convert HTML elements to Markdown in a single walk, one line
+            # (or block) per piece
+            pieces = []
+            TextScraper._append_markdown(container, pieces)
+            if pieces:
+                markdown_content.append('\n'.join(pieces))
         
         return '\n\n'.join(markdown_content)
     
-    def _format_markdown(self, title: str, url: str, content: str) -> str:
-        """Format content as markdown with frontmatter."""
-        return f"""---
-title: {title}
-source: {url}
-date_scraped: {datetime.now().isoformat()}
----
-
-# {title}
-
-{content}
-"""
+    @staticmethod
+    def _append_markdown(node: 'Node', pieces: List[str]):
+        """Append the Markdown for a node's children to pieces."""
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == '-text':
+                text = child.text_content.strip()
+            elif tag in _HEADING_TAGS:
+                text = f"{'#' * int(tag[1])} {child.text().strip()}".strip()
+            elif tag == 'p':
+                text = child.text().strip()
+            elif tag == 'ul' or tag == 'ol':
+                number = 0
+                for item in child.iter(include_text=True):
+                    if item.tag == 'li':
+                        number += 1
+                        marker = '*' if tag == 'ul' else f"{number}."
+                        pieces.append(f"{marker} {item.text().strip()}")
+                    elif item.tag == '-text':
+                        if text := item.text_content.strip():
+                            pieces.append(text)
+                    elif not item.tag.startswith('-'):
+                        TextScraper._append_markdown(item, pieces)
+                continue
+            elif tag == 'blockquote':
+                lines = child.text().strip().split('\n')
+                text = '\n'.join(f"> {line.strip()}" for line in lines if line.strip())
+            elif tag == 'em':
+                text = f"_{child.text().strip()}_"
+            elif tag == 'strong':
+                text = f"**{child.text().strip()}**"
+            elif tag.startswith('-'):
+                # Comments and other non-element nodes
+                continue
+            else:
+                TextScraper._append_markdown(child, pieces)
+                continue
+            
+            if text:
+                pieces.append(text)
+    
+    def _format_markdown(self, title: str, url: str, content: str) -> bytes:
+        """Format content as UTF-8 encoded markdown with frontmatter."""
+        return self._format_frontmatter(title, url) + self._format_chapter(title, content)
+    
+    def _format_frontmatter(self, title: str, url: str) -> bytes:
+        """Format the UTF-8 encoded frontmatter block of a markdown file."""
+        return b''.join([
+            b'---\ntitle: ', title.encode('utf-8'),
+            b'\nsource: ', url.encode('utf-8'),
+            b'\ndate_scraped: ', datetime.now().isoformat().encode('ascii'),
+            b'\n---\n\n',
+        ])
+    
+    def _format_chapter(self, title: str, content: str) -> bytes:
+        """Format a titled chapter body as UTF-8 encoded markdown."""
+        return b''.join([
+            b'# ', title.encode('utf-8'),
+            b'\n\n', content.encode('utf-8'), b'\n',
+        ])
 
     def _clean_filename(self, text: str) -> str:
         """Create a clean filename from text."""
         # Remove invalid characters and clean up the text
-        clean = re.sub(r'[^\w\s-]', '', text).strip().lower()
-        return re.sub(r'[-\s]+', '-', clean)
+        clean = _FILENAME_STRIP.sub('', text).strip().lower()
+        return _FILENAME_COLLAPSE.sub('-', clean)
 
     async def find_relevant_urls(self, query: str, max_urls: int = 5) -> List[str]:
         """Find relevant URLs for a given query."""
@@ -597,13 +1072,12 @@ date_scraped: {datetime.now().isoformat()}
     async def _search_cached_content(self, query: str, max_urls: int = 5) -> List[str]:
         """Search through cached content."""
         try:
-            relevant_urls = []
-            for url, content in self.url_cache.items():
-                if any(term.lower() in content.lower() for term in query.split()):
-                    relevant_urls.append(url)
-                    if len(relevant_urls) >= max_urls:
-                        break
-            return relevant_urls
+            relevant_urls: Dict[str, None] = {}
+            for term in _TOKEN_RE.findall(query.lower()):
+                relevant_urls.update(self._inv_index.get(term, {}))
+                if len(relevant_urls) >= max_urls:
+                    break
+            return list(relevant_urls)[:max_urls]
         except Exception as e:
             logging.error(f"Cache search failed: {str(e)}")
             return []
@@ -624,7 +1098,7 @@ date_scraped: {datetime.now().isoformat()}
                     break
                 try:
                     search_url = f"{base_url}{query.replace(' ', '_')}"
-                    async with self.aio_session.head(search_url) as response:
+                    async with self._sem_for(search_url), self.aio_session.head(search_url) as response:
                         if response.status == 200:
                             relevant_urls.append(search_url)
                 except:
@@ -640,10 +1114,10 @@ date_scraped: {datetime.now().isoformat()}
         """Update relevance score for a source."""
         metadata_file = self.metadata_dir / f"{self._get_safe_filename(url)}.json"
         if metadata_file.exists():
-            metadata = json.loads(metadata_file.read_text())
+            metadata = _load_json(await asyncio.to_thread(metadata_file.read_bytes))
             metadata['relevance_score'] = score
             metadata['last_updated'] = datetime.now().isoformat()
-            metadata_file.write_text(json.dumps(metadata, indent=2))
+            await asyncio.to_thread(metadata_file.write_bytes, _dump_json(metadata))
 
     async def adjust_scraping_patterns(self, feedback: Dict[str, Any]):
         """Adjust scraping patterns based on feedback."""
@@ -700,20 +1174,30 @@ date_scraped: {datetime.now().isoformat()}
         if not content:
             return 0.0
             
+        words = content.split()
+        word_count = len(words)
+        
         # Basic quality metrics
         metrics = {
             'length': len(content) / 1000,  # Normalized by 1000 chars
-            'sentence_count': len(content.split('. ')),
-            'word_count': len(content.split()),
-            'avg_word_length': sum(len(w) for w in content.split()) / len(content.split()) if content.split() else 0
+            'sentence_count': content.count('. ') + 1,
+            'word_count': word_count,
+            'avg_word_length': sum(map(len, words)) / word_count if word_count else 0
         }
         
+        # Bit n is set once group n + 1 of _QUAL_RE has matched
+        found = 0
+        for match in _QUAL_RE.finditer(content):
+            found |= 1 << (match.lastindex - 1)
+            if found == _QUAL_ALL:
+                break
+        
         # Quality indicators
         indicators = {
-            'has_punctuation': bool(re.search(r'[.,!?]', content)),
-            'has_paragraphs': content.count('\n\n') > 0,
-            'proper_capitalization': bool(re.search(r'[A-Z][a-z]', content)),
-            'no_excessive_spacing': not bool(re.search(r'\s{3,}', content))
+            'has_punctuation': bool(found & 0b001),
+            'has_paragraphs': '\n\n' in content,
+            'proper_capitalization': bool(found & 0b100),
+            'no_excessive_spacing': not found & 0b010
         }
         
         # Calculate final score (0.0 to 1.0)
@@ -752,12 +1236,59 @@ date_scraped: {datetime.now().isoformat()}
             logging.error(f"Error processing URL {url}: {str(e)}")
             return None
 
-async def main_async():
+def _parse_html_worker(html: Union[str, bytes], url: str) -> Tuple[str, Dict]:
+    """Extract the cleaned text and metadata of a downloaded page.
+
+    Kept at module level so it can run in TextScraper's process pool.
+    """
+    tree = _parse_html(html)
+    
+    # Extract main content
+    # Remove script and style elements
+    tree.strip_tags(['script', 'style', 'nav', 'header', 'footer'], recursive=True)
+    
+    # Extract text from the main content area; a single container avoids
+    # repeating text from nested matches such as an article inside div.content
+    container = (
+        tree.css_first('article')
+        or tree.css_first('main')
+        or tree.css_first(_CONTENT_SELECTOR)
+        or tree.body
+        or tree.root
+    )
+    
+    text = container.text(separator=' ', strip=True)
+    cleaned_text = TextScraper._clean_text(text)
+    
+    # Extract metadata
+    metadata = TextScraper._extract_metadata(tree, url)
+    
+    return cleaned_text, metadata
+
+def _crawl_page_worker(html: Union[str, bytes], url: str) -> Tuple[str, List[Tuple[str, str]], Optional[str]]:
+    """Extract the title, section links and, for pages without sections, the markdown of a crawled page.
+
+    Kept at module level so it can run in TextScraper's process pool.
+    """
+    tree = _parse_html(html)
+    title = TextScraper._extract_title(tree, url)
+    sections = TextScraper._find_nested_sections(tree, url)
+    content = None if sections else TextScraper._extract_chapter_content(tree)
+    return title, sections, content
+
+def _chapter_content_worker(html: Union[str, bytes]) -> str:
+    """Extract the markdown of a crawled content page.
+
+    Kept at module level so it can run in TextScraper's process pool.
+    """
+    return TextScraper._extract_chapter_content(_parse_html(html))
+
+async def main_async(url: Optional[str] = None, single_file: bool = False, use_cache: bool = True):
     """Main async function."""
     try:
         # Get URL from command line arguments or prompt
-        if len(sys.argv) > 1:
-            url = sys.argv[1].strip()
+        if url:
+            url = url.strip()
         else:
             url = input("Enter the URL to scrape (e.g., https://vedabase.io/en/library/bg/): ").strip()
 
@@ -766,7 +1297,7 @@ async def main_async():
             return
 
         logger.info(f"Starting to crawl: {url}")
-        scraper = TextScraper()
+        scraper = TextScraper(single_file=single_file, use_cache=use_cache)
         await scraper.initialize()
         await scraper.crawl_nested_content(url)
         await scraper.cleanup()
@@ -778,7 +1309,14 @@ async def main_async():
 
 def main():
     """Main function."""
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Crawl a text source and save it as markdown.")
+    parser.add_argument('url', nargs='?', help="URL to crawl (prompted for if omitted)")
+    parser.add_argument('--single-file', action='store_true',
+                        help="write all chapters of a book into one markdown file")
+    parser.add_argument('--refresh', action='store_true',
+                        help="fetch every page again instead of using cached HTML")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.url, args.single_file, use_cache=not args.refresh))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,14 @@
+"""Shared pytest configuration."""
+from typing import Any, Callable, Dict
+
+try:
+    import uvloop
+except ImportError:  # optional: faster event loop for async tests
+    uvloop = None
+
+if uvloop is not None:
+    # pytest-asyncio rejects an empty result from this hook, so it is only
+    # defined when there is a loop to offer
+    def pytest_asyncio_loop_factories(config: Any, item: Any) -> Dict[str, Callable]:
+        """Run async tests on uvloop."""
+        return {"uvloop": uvloop.new_event_loop}
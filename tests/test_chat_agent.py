@@ -43,8 +43,9 @@ def test_chat_agent_initialization(mock_groq):
     assert agent.llm == mock_llm
     assert isinstance(agent.memory, MemoryManager)
     
+@pytest.mark.asyncio
 @patch('app.agents.chat_agent.GroqChatModel')
-def test_chat_agent_process_message(mock_groq):
+async def test_chat_agent_process_message(mock_groq):
     """Test message processing."""
     # Setup
     mock_llm = Mock()
@@ -53,7 +54,7 @@ def test_chat_agent_process_message(mock_groq):
     
     # Execute
     agent = ChatAgent(api_key='test_key')
-    response = agent.process_message("Hello!")
+    response = await agent.process_message("Hello!")
     
     # Verify
     assert isinstance(response, str)
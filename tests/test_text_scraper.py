@@ -0,0 +1,106 @@
+"""
+Test suite for the text scraper's offline helpers.
+"""
+import pytest
+from pathlib import Path
+from typing import Dict
+
+from scripts.text_scraper import TextScraper, _parse_html
+
+BASE_URL = "http://h/b/"
+
+@pytest.fixture
+def scraper(tmp_path: Path) -> TextScraper:
+    """Fixture for a scraper that never touches the network or FireCrawl."""
+    scraper = TextScraper.__new__(TextScraper)
+    scraper.base_dir = tmp_path
+    scraper.single_file = True
+    scraper._chapters = {}
+    return scraper
+
+def _nav(*hrefs: str) -> str:
+    """Build a page whose navigation links to each href, titled by position."""
+    links = ''.join(f'<li><a href="{href}">Link {i}</a></li>' for i, href in enumerate(hrefs))
+    return f'<html><body><nav class="toc"><ul>{links}</ul></nav></body></html>'
+
+@pytest.mark.parametrize("href,expected", [
+    ("/b/c1", "http://h/b/c1"),
+    ("c2", "http://h/b/c2"),
+    ("./c3", "http://h/b/c3"),
+    ("/b/./c4", "http://h/b/c4"),
+    ("/b/../b/c5", "http://h/b/c5"),
+    ("http://h/b/c6", "http://h/b/c6"),
+    ("/b/c7?page=2", "http://h/b/c7?page=2"),
+])
+def test_find_nested_sections_resolves_links(scraper: TextScraper, href: str, expected: str):
+    """Test that links under the base URL resolve like urljoin."""
+    sections = scraper._find_nested_sections(_parse_html(_nav(href)), BASE_URL)
+    assert sections == [("Link 0", expected)]
+
+@pytest.mark.parametrize("href", [
+    "/b/../x",
+    "../x",
+    "/other",
+    "//elsewhere/b/c",
+    "http://other/b/c",
+    "#top",
+    "javascript:void(0)",
+    "mailto:someone@h",
+])
+def test_find_nested_sections_rejects_links(scraper: TextScraper, href: str):
+    """Test that links outside the base URL are not treated as sections."""
+    assert scraper._find_nested_sections(_parse_html(_nav(href)), BASE_URL) == []
+
+def test_find_nested_sections_keeps_order_and_skips_untitled(scraper: TextScraper):
+    """Test that sections keep page order and links without text are skipped."""
+    html = _nav("/b/c1", "c2").replace('</ul>', '<li><a href="c3"></a></li></ul>')
+    sections = scraper._find_nested_sections(_parse_html(html), BASE_URL)
+    assert sections == [("Link 0", "http://h/b/c1"), ("Link 1", "http://h/b/c2")]
+
+def _book_metadata(urls: Dict[str, str]) -> Dict:
+    """Build root crawl metadata with one nested container of content sections."""
+    return {
+        'title': 'Book',
+        'url': BASE_URL,
+        'type': 'container',
+        'sections': [
+            {'title': 'Part', 'url': BASE_URL + 'part/', 'type': 'container', 'sections': [
+                {'title': title, 'url': url, 'type': 'content'} for title, url in urls.items()
+            ]},
+        ],
+    }
+
+def test_write_book_records_chapter_offsets(scraper: TextScraper):
+    """Test that each chapter's offset points at its heading in the book file."""
+    urls = {'One': BASE_URL + 'part/1', 'Two': BASE_URL + 'part/2'}
+    for title, url in urls.items():
+        scraper._chapters[url] = scraper._format_chapter(title, f"Text of {title.lower()}.")
+    metadata = _book_metadata(urls)
+    book_path = scraper.base_dir / "book.md"
+
+    scraper._write_book(book_path, metadata)
+
+    data = book_path.read_bytes()
+    assert data.count(b'\n---\n\n') == 2  # one frontmatter block, one separator
+    assert metadata['file_path'] == "book.md"
+    sections = metadata['sections'][0]['sections']
+    for section in sections:
+        assert section['file_path'] == "book.md"
+        chapter = scraper._format_chapter(section['title'], f"Text of {section['title'].lower()}.")
+        assert data[section['offset']:section['offset'] + len(chapter)] == chapter
+    assert scraper._chapters == {}
+
+def test_write_book_skips_missing_chapters(scraper: TextScraper):
+    """Test that a chapter without content gets no offset and no separator."""
+    urls = {'One': BASE_URL + 'part/1', 'Two': BASE_URL + 'part/2'}
+    scraper._chapters[urls['Two']] = scraper._format_chapter('Two', "Text of two.")
+    metadata = _book_metadata(urls)
+    book_path = scraper.base_dir / "book.md"
+
+    scraper._write_book(book_path, metadata)
+
+    data = book_path.read_bytes()
+    first, second = metadata['sections'][0]['sections']
+    assert 'offset' not in first
+    assert data[second['offset']:].startswith(b'# Two\n\n')
+    assert data.count(b'\n---\n\n') == 1